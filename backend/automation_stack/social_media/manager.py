@@ -164,6 +164,39 @@ class SocialMediaManager:
         Returns:
             Dictionary with post details and status
         """
+        return self.schedule_posts([{
+            'platform_name': platform_name,
+            'content_path': content_path,
+            'caption': caption,
+            'post_time': post_time,
+            **kwargs
+        }])[0]
+    
+    def schedule_posts(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Schedule several posts, saving the scheduled posts file only once.
+        
+        Args:
+            posts: List of dictionaries with the same keys as the
+                   arguments of schedule_post
+            
+        Returns:
+            List of post dictionaries, in the same order as the input
+        """
+        results = [self._schedule_post(**post) for post in posts]
+        if any(result.get('status') == 'scheduled' for result in results):
+            self.save_scheduled_posts()
+        return results
+    
+    def _schedule_post(
+        self,
+        platform_name: str,
+        content_path: Union[str, Path],
+        caption: str,
+        post_time: Optional[Union[datetime, str]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Schedule a single post without saving the scheduled posts file."""
         # Normalize platform name
         platform_name = platform_name.lower()
         
@@ -228,7 +261,6 @@ class SocialMediaManager:
             )
             
             self.scheduled_posts.append(post)
-            self.save_scheduled_posts()
             self.logger.info(
                 f"Scheduled {platform_name} post for {post_time}"
             )
@@ -261,7 +293,7 @@ class SocialMediaManager:
             })
             # Analytics event: scheduling error
             try:
-                import requests, datetime
+                import requests
                 requests.post(
                     "http://localhost:8000/api/analytics/event",
                     json={
@@ -272,7 +304,7 @@ class SocialMediaManager:
                         "scheduled_time": post_time.isoformat() if hasattr(post_time, 'isoformat') else str(post_time),
                         "status": "error",
                         "error": str(e),
-                        "timestamp": datetime.datetime.utcnow().isoformat()
+                        "timestamp": datetime.utcnow().isoformat()
                     }, timeout=3
                 )
             except Exception:
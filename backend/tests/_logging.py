@@ -0,0 +1,28 @@
+"""
+Shared logging setup for the test scripts.
+"""
+import os
+import logging
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_configured = False
+
+def configure_once(level=None, format=LOG_FORMAT, handlers=None):
+    """
+    Configure root logging the first time it is called; later calls are no-ops.
+    
+    Args:
+        level: Log level, defaulting to the TEST_LOG_LEVEL environment variable or INFO
+        format: Format string for handlers that have no formatter of their own
+        handlers: Handlers to attach to the root logger (default: a StreamHandler)
+    """
+    global _configured
+    if _configured:
+        return
+    logging.basicConfig(
+        level=level or os.environ.get('TEST_LOG_LEVEL', 'INFO'),
+        format=format,
+        handlers=handlers
+    )
+    _configured = True
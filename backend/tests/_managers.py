@@ -0,0 +1,32 @@
+"""
+Shared SocialMediaManager setup for the test scripts.
+"""
+import os
+
+TIKTOK_TEST_CONFIG = {
+    'mock_mode': True,
+    'client_key': 'test_client_key',
+    'client_secret': 'test_client_secret',
+    'username': 'test_tiktok_user'
+}
+
+def instagram_test_config():
+    """Build the dry-run Instagram configuration from the environment."""
+    return {
+        'access_token': os.getenv('INSTAGRAM_ACCESS_TOKEN', 'dummy_token'),
+        'page_id': os.getenv('INSTAGRAM_PAGE_ID', 'dummy_page_id'),
+        'app_id': os.getenv('FACEBOOK_APP_ID', 'dummy_app_id'),
+        'app_secret': os.getenv('FACEBOOK_APP_SECRET', 'dummy_app_secret'),
+        'dry_run': True  # Enable dry run mode for testing
+    }
+
+def create_test_manager():
+    """Create a SocialMediaManager with dry-run Instagram and mock TikTok platforms."""
+    from automation_stack.social_media.manager import SocialMediaManager
+    from automation_stack.social_media.instagram_platform import InstagramPlatform
+    from automation_stack.social_media.platforms.tiktok import Tiktok
+    
+    manager = SocialMediaManager()
+    manager.register_platform('instagram', InstagramPlatform(instagram_test_config()))
+    manager.register_platform('tiktok', Tiktok(TIKTOK_TEST_CONFIG))
+    return manager
@@ -0,0 +1,10 @@
+"""
+Shared filesystem helpers for the test scripts.
+"""
+import os
+
+def ensure_dir(path):
+    """Create a directory and any missing parents; an existing one is left alone."""
+    # No per-process cache: a relative path or a directory removed between
+    # runs would make it stale, and makedirs on an existing directory is cheap
+    os.makedirs(path, exist_ok=True)
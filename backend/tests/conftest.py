@@ -0,0 +1,9 @@
+"""Shared fixtures for the test suite."""
+import pytest
+
+from tests._managers import create_test_manager
+
+@pytest.fixture(scope="session")
+def manager():
+    """Create one social media manager with test platforms for the whole session."""
+    return create_test_manager()
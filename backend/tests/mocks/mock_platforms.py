@@ -1,6 +1,7 @@
 """Mock implementations of social media platforms for testing."""
+import time
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 from automation_stack.platforms.base_platform import SocialMediaPlatform
 
 class MockSocialMediaPlatform(SocialMediaPlatform):
@@ -8,6 +9,8 @@ class MockSocialMediaPlatform(SocialMediaPlatform):
     
     def __init__(self):
         self.posts = []
+        self.posts_by_id = {}
+        self._next_id = 1
         self.authenticated = False
         self.name = "mock"
     
@@ -21,25 +24,30 @@ class MockSocialMediaPlatform(SocialMediaPlatform):
         if not self.authenticated:
             raise ValueError("Not authenticated")
             
+        post_number = self._next_id
+        self._next_id += 1
         post = {
-            "id": f"mock_post_{len(self.posts) + 1}",
+            "id": f"mock_post_{post_number}",
             "content": content,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "metadata": kwargs
         }
         self.posts.append(post)
+        self.posts_by_id[post["id"]] = post
         return {"status": "success", "post_id": post["id"], "platform": self.name}
     
     def get_post(self, post_id: str) -> Optional[Dict[str, Any]]:
         """Mock getting a post by ID."""
-        for post in self.posts:
-            if post["id"] == post_id:
-                return post
-        return None
+        return self.posts_by_id.get(post_id)
+    
+    @staticmethod
+    def timestamp(post: Dict[str, Any]) -> str:
+        """Format a mock post's creation time as a UTC ISO string."""
+        return datetime.fromtimestamp(post["timestamp_ns"] / 1e9, tz=timezone.utc).isoformat()
     
     def get_posts(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Mock getting recent posts."""
-        return self.posts[-limit:]
+        return self.posts[max(0, len(self.posts) - limit):]
 
 class MockInstagramPlatform(MockSocialMediaPlatform):
     """Mock Instagram platform implementation."""
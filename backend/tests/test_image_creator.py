@@ -2,17 +2,23 @@
 Standalone test for the simple image creator.
 """
 import os
+import sys
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 import textwrap
 
+# Put the backend root on the Python path so tests._paths imports when run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tests._paths import ensure_dir
+
 def create_test_image():
     """Create a test image using basic Pillow functionality."""
     print("Creating test image...")
     
     # Configuration
     output_dir = Path("test_output")
-    output_dir.mkdir(exist_ok=True)
+    ensure_dir(output_dir)
     
     # Image dimensions
     width, height = 1080, 1080
@@ -3,24 +3,73 @@ Detailed test script to verify manager-platform interaction.
 """
 import os
 import sys
+import queue
+import atexit
 import logging
+import logging.handlers
 import tempfile
 from pathlib import Path
 
+# Put the backend root on the Python path so tests._logging imports when run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tests._logging import LOG_FORMAT, configure_once
+
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-# Set up detailed logging
-logging.basicConfig(
-    level=logging.DEBUG,  # More verbose logging
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('test_manager_interaction.log', mode='w')
-    ]
+class BufferedFileHandler(logging.FileHandler):
+    """File handler with a 64KiB write buffer that only flushes on ERROR and close."""
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536, encoding='utf-8')
+    
+    def emit(self, record):
+        # Same as FileHandler.emit minus StreamHandler's flush after every record;
+        # flush() itself still works for logging.shutdown and callers
+        if self.stream is None:
+            # As in FileHandler, a closed 'w' handler is not reopened, which
+            # would truncate the log
+            if self.mode != 'w' or not self._closed:
+                self.stream = self._open()
+        if not self.stream:
+            return
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+# Set up detailed logging. Records are handed to a queue and written by a
+# single listener thread, so callers never block on stream/file writes.
+log_formatter = logging.Formatter(LOG_FORMAT)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(log_formatter)
+file_handler = BufferedFileHandler('test_manager_interaction.log', mode='w')
+file_handler.setFormatter(log_formatter)
+# Batch file writes; anything at ERROR or above is written out immediately
+memory_handler = logging.handlers.MemoryHandler(
+    512,
+    flushLevel=logging.ERROR,
+    target=file_handler
+)
+atexit.register(memory_handler.flush)
+
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, stream_handler, memory_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+configure_once(
+    format='%(message)s',  # Final formatting happens on the listener side
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 logger = logging.getLogger('test_manager')
 
+# Full tracebacks are only rendered when VERBOSE_ERRORS is set
+VERBOSE_ERRORS = bool(os.environ.get('VERBOSE_ERRORS'))
+
 class TestPlatform:
     """Test platform with detailed logging."""
     
@@ -39,15 +88,16 @@ class TestPlatform:
             self.logger.info("Authentication successful")
             return True
         except Exception as e:
-            self.logger.error("Authentication failed: %s", str(e), exc_info=True)
+            self.logger.error("Authentication failed: %s (%s)", str(e), type(e).__name__)
             return False
     
     def post_image(self, image_path, caption, **kwargs):
         """Simulate posting an image with detailed logging."""
         self.logger.info("Starting post_image")
-        self.logger.debug("  image_path: %s", image_path)
-        self.logger.debug("  caption: %s", caption)
-        self.logger.debug("  kwargs: %s", kwargs)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("  image_path: %s", image_path)
+            self.logger.debug("  caption: %s", caption)
+            self.logger.debug("  kwargs: %s", kwargs)
         
         if not self.authenticated:
             error_msg = 'Not authenticated'
@@ -78,18 +128,22 @@ class TestPlatform:
             
         except Exception as e:
             error_msg = f'Error in post_image: {str(e)}'
-            self.logger.error(error_msg, exc_info=True)
+            self.logger.error("%s: %s", error_msg, type(e).__name__)
             return {'status': 'error', 'message': error_msg}
 
 def create_test_file(file_path, content="Test content"):
     """Create a test file with logging."""
     try:
-        with open(file_path, 'w') as f:
-            f.write(content)
+        # Throwaway file in a temp dir: skip the text I/O stack and fsync
+        fd = os.open(str(file_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, content.encode('ascii'))
+        finally:
+            os.close(fd)
         logger.info("Created test file: %s", file_path)
         return True
     except Exception as e:
-        logger.error("Error creating test file: %s", str(e), exc_info=True)
+        logger.error("Error creating test file: %s", str(e), exc_info=VERBOSE_ERRORS)
         return False
 
 def test_manager_interaction():
@@ -162,7 +216,7 @@ def test_manager_interaction():
             return True
             
         except Exception as e:
-            logger.error("❌ Error during test: %s", str(e), exc_info=True)
+            logger.error("❌ Error during test: %s", str(e), exc_info=VERBOSE_ERRORS)
             return False
 
 if __name__ == "__main__":
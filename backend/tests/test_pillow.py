@@ -1,10 +1,41 @@
 """
 Simple script to test Pillow installation and basic image creation.
 """
-from PIL import Image, ImageDraw, ImageFont
 import os
+import sys
+import functools
+from pathlib import Path
+
+# Put the backend root on the Python path so tests._paths imports when run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tests._paths import ensure_dir
+
+_TEXT = "Pillow is working!"
+
+def _load_font():
+    """Load the test font, only probing for Arial when TEST_PILLOW_TRUETYPE is set."""
+    from PIL import ImageFont
+    
+    if os.environ.get("TEST_PILLOW_TRUETYPE"):
+        try:
+            return ImageFont.truetype("arial.ttf", 30)
+        except IOError:
+            print("Using default font (Arial not found)")
+    return ImageFont.load_default()
+
+@functools.lru_cache(maxsize=None)
+def _text_layout():
+    """Return the test font and text bbox; both are fixed, so compute them once."""
+    from PIL import Image, ImageDraw
+    
+    font = _load_font()
+    bbox = ImageDraw.Draw(Image.new('RGB', (1, 1))).textbbox((0, 0), _TEXT, font=font)
+    return font, bbox
 
 def main():
+    from PIL import Image, ImageDraw
+    
     print("Testing Pillow installation...")
     
     # Create a new image
@@ -12,16 +43,9 @@ def main():
     image = Image.new('RGB', (width, height), color='white')
     draw = ImageDraw.Draw(image)
     
-    # Try to use a font
-    try:
-        font = ImageFont.truetype("arial.ttf", 30)
-    except IOError:
-        print("Using default font (Arial not found)")
-        font = ImageFont.load_default()
-    
     # Draw some text
-    text = "Pillow is working!"
-    text_bbox = draw.textbbox((0, 0), text, font=font)
+    font, text_bbox = _text_layout()
+    text = _TEXT
     text_width = text_bbox[2] - text_bbox[0]
     text_height = text_bbox[3] - text_bbox[1]
     
@@ -33,7 +57,7 @@ def main():
     
     # Save the image
     output_dir = "test_output"
-    os.makedirs(output_dir, exist_ok=True)
+    ensure_dir(output_dir)
     output_path = os.path.join(output_dir, "test_pillow.png")
     image.save(output_path)
     
@@ -5,39 +5,16 @@ import os
 import json
 import logging
 from pathlib import Path
-from dotenv import load_dotenv
+
+from tests._logging import configure_once
+from tests._managers import create_test_manager
 
 # Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_once()
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-
-def test_instagram_post():
+def test_instagram_post(manager):
     """Test posting to Instagram."""
-    from automation_stack.social_media.manager import SocialMediaManager
-    from automation_stack.social_media.instagram_platform import InstagramPlatform
-    
-    # Configuration for Instagram
-    config = {
-        'access_token': os.getenv('INSTAGRAM_ACCESS_TOKEN', 'dummy_token'),
-        'page_id': os.getenv('INSTAGRAM_PAGE_ID', 'dummy_page_id'),
-        'app_id': os.getenv('FACEBOOK_APP_ID', 'dummy_app_id'),
-        'app_secret': os.getenv('FACEBOOK_APP_SECRET', 'dummy_app_secret'),
-        'dry_run': True  # Enable dry run mode for testing
-    }
-    
-    # Initialize the manager
-    manager = SocialMediaManager()
-    
-    # Create and register Instagram platform
-    instagram = InstagramPlatform(config)
-    manager.register_platform('instagram', instagram)
-    
     # Test image path (using our test image)
     test_image_path = os.path.join('test_output', 'test_output.png')
     
@@ -69,11 +46,16 @@ This is a test post with a hashtag.
 
 def main():
     """Run the social media tests."""
+    from dotenv import load_dotenv
+    
+    # Load environment variables
+    load_dotenv()
+    
     print("=== Testing Social Media Integration ===\n")
     
     # Test Instagram
     print("Testing Instagram integration...")
-    insta_result = test_instagram_post()
+    insta_result = test_instagram_post(create_test_manager())
     
     if insta_result.get('status') in ['scheduled', 'success']:
         print("\n✅ Instagram test completed successfully!")
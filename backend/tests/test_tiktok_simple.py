@@ -4,47 +4,60 @@ Simple test script for the TikTok platform implementation.
 import os
 import sys
 import logging
+import functools
 from pathlib import Path
 
 # Add the project root to the Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# tests._logging and tests._paths live under the backend root, not tests/
+sys.path.insert(0, str(project_root.resolve().parent))
+
+from tests._logging import configure_once
+
 # Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
+configure_once()
 logger = logging.getLogger('test_tiktok_simple')
 
-def main():
-    """Run a simple test of the TikTok platform."""
+@functools.lru_cache(maxsize=4)
+def _get_tiktok(config_items):
+    """Return a TikTok platform for the given config, reusing earlier instances."""
     from automation_stack.social_media.platforms.tiktok import Tiktok
+    return Tiktok(dict(config_items))
+
+def main(manager=None):
+    """
+    Run a simple test of the TikTok platform.
+    
+    Args:
+        manager: Optional SocialMediaManager with a registered 'tiktok'
+                 platform to reuse instead of creating a new one
+    """
+    from tests._managers import TIKTOK_TEST_CONFIG
+    from tests._paths import ensure_dir
     
     print("=== TikTok Platform Simple Test ===\n")
     
     # Create test output directory
     test_output_dir = project_root / 'test_output'
-    test_output_dir.mkdir(exist_ok=True)
+    ensure_dir(test_output_dir)
     
     # Create a test video file (just a text file for testing)
     test_video = test_output_dir / 'test_video.txt'
-    with open(test_video, 'w') as f:
-        f.write("This is a test video file for TikTok testing.")
+    if not test_video.exists():
+        test_video.write_bytes(b"This is a test video file for TikTok testing.")
     
     print(f"Created test video file: {test_video}")
     
     # Initialize the TikTok platform with mock mode
     print("\nInitializing TikTok platform with mock mode...")
-    tiktok = Tiktok({
-        'mock_mode': True,
-        'client_key': 'test_client_key',
-        'client_secret': 'test_client_secret',
-        'username': 'test_tiktok_user'
-    })
+    if manager is not None:
+        tiktok = manager.platforms['tiktok']
+    else:
+        tiktok = _get_tiktok(tuple(sorted(TIKTOK_TEST_CONFIG.items())))
+    # The platform may be shared with earlier runs, so start from a clean slate
+    tiktok.mock_videos = []
     
     # Test authentication
     print("\nTesting authentication...")
@@ -2,17 +2,19 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from http import HTTPStatus
-from fastapi.testclient import TestClient
-
-# Import the FastAPI app
-from automation_stack.health import app
 
 class TestHealthCheck(unittest.TestCase):
     """Test health check endpoints."""
     
-    def setUp(self):
-        """Set up test client."""
-        self.client = TestClient(app)
+    @classmethod
+    def setUpClass(cls):
+        """Set up a test client shared by all tests in the class."""
+        from fastapi.testclient import TestClient
+        
+        # Import the FastAPI app
+        from automation_stack.health import app
+        
+        cls.client = TestClient(app)
         
     def test_health_endpoint(self):
         """Test the health check endpoint."""
@@ -0,0 +1,64 @@
+"""Unit tests for batch scheduling in the social media manager."""
+import unittest
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+from automation_stack.social_media.manager import SocialMediaManager
+
+class TestSchedulePosts(unittest.TestCase):
+    """Test SocialMediaManager.schedule_posts."""
+
+    def setUp(self):
+        """Create a manager that touches no files, platforms or network."""
+        patch.object(SocialMediaManager, '_initialize_platforms').start()
+        patch.object(SocialMediaManager, 'load_scheduled_posts').start()
+        patch('automation_stack.social_media.manager.schedule').start()
+        # Scheduling reports an analytics event over HTTP
+        patch('requests.post').start()
+        self.save = patch.object(SocialMediaManager, 'save_scheduled_posts').start()
+        self.addCleanup(patch.stopall)
+
+        self.manager = SocialMediaManager()
+        self.manager.register_platform("mock", MagicMock())
+
+    def test_schedule_posts_saves_once_in_order(self):
+        """Test that a batch keeps its order and saves the file once."""
+        posts = [
+            {
+                "platform_name": "mock",
+                "content_path": f"/tmp/post_{i}.jpg",
+                "caption": f"Test post {i}",
+                "post_time": datetime(2024, 1, 1, 9, i).isoformat()
+            }
+            for i in range(3)
+        ]
+
+        results = self.manager.schedule_posts(posts)
+
+        self.assertEqual([r["caption"] for r in results], ["Test post 0", "Test post 1", "Test post 2"])
+        self.assertTrue(all(r["status"] == "scheduled" for r in results))
+        self.assertEqual(self.manager.scheduled_posts, results)
+        self.save.assert_called_once_with()
+
+    def test_schedule_post_wraps_batch(self):
+        """Test that scheduling one post also saves the file once."""
+        result = self.manager.schedule_post(
+            platform_name="mock",
+            content_path="/tmp/post.jpg",
+            caption="Single post",
+            post_time=datetime(2024, 1, 1, 9, 0)
+        )
+
+        self.assertEqual(result["status"], "scheduled")
+        self.save.assert_called_once_with()
+
+    def test_schedule_posts_skips_save_when_nothing_scheduled(self):
+        """Test that a batch with only rejected posts does not save."""
+        results = self.manager.schedule_posts([
+            {"platform_name": "unknown", "content_path": "/tmp/post.jpg", "caption": "Nope"}
+        ])
+
+        self.assertEqual(results[0]["status"], "error")
+        self.save.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
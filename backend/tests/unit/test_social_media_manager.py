@@ -1,10 +1,9 @@
 """Unit tests for the social media manager."""
 import unittest
-import tempfile
-import json
+import logging
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
-from automation_stack.manager import SocialMediaManager
+from automation_stack.social_media.manager import SocialMediaManager
 from automation_stack.platforms.base_platform import SocialMediaPlatform
 
 class MockPlatform(SocialMediaPlatform):
@@ -12,139 +11,153 @@ class MockPlatform(SocialMediaPlatform):
     
     def __init__(self):
         self.name = "mock"
+        self.authenticated = True
         self.posted_content = []
-        
+    
     def authenticate(self, **kwargs):
         return True
-        
-    def post(self, content, **kwargs):
-        self.posted_content.append(content)
-        return {"status": "success", "post_id": "123"}
+    
+    def post(self, content_path, caption, **kwargs):
+        self.posted_content.append(caption)
+        return {"status": "success", "id": "123"}
+
+class _NoExcInfo(logging.Filter):
+    """Drop exception info so captured records skip traceback formatting."""
+    
+    def filter(self, record):
+        record.exc_info = None
+        record.exc_text = None
+        return True
 
 class TestSocialMediaManager(unittest.TestCase):
     """Test the social media manager functionality."""
     
-    def setUp(self):
-        """Set up test environment."""
-        # Create a temporary directory for test data
-        self.test_dir = tempfile.mkdtemp()
-        self.db_path = f"sqlite:///{self.test_dir}/test.db"
-        
-        # Initialize manager with test database
-        self.manager = SocialMediaManager(database_url=self.db_path)
-        
-        # Register mock platform
-        self.mock_platform = MockPlatform()
-        self.manager.register_platform("mock", self.mock_platform)
-        
-        # Create test posts
-        self.test_posts = [
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared test fixtures once for the class."""
+        # Create test posts around a fixed reference time
+        cls._ref = datetime(2024, 1, 1, 9, 0, 0)
+        cls.test_posts = [
             {
-                "platform": "mock",
-                "content": "Test post 1",
-                "scheduled_time": (datetime.utcnow() + timedelta(minutes=5)).isoformat(),
-                "status": "scheduled"
+                "platform_name": "mock",
+                "content_path": "/tmp/post_1.jpg",
+                "caption": "Test post 1",
+                "post_time": (cls._ref + timedelta(minutes=5)).isoformat()
             },
             {
-                "platform": "mock",
-                "content": "Test post 2",
-                "scheduled_time": (datetime.utcnow() - timedelta(minutes=5)).isoformat(),
-                "status": "scheduled"
+                "platform_name": "mock",
+                "content_path": "/tmp/post_2.jpg",
+                "caption": "Test post 2",
+                "post_time": (cls._ref - timedelta(minutes=5)).isoformat()
             }
         ]
     
-    def tearDown(self):
-        """Clean up test environment."""
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+    def setUp(self):
+        """Give each test its own manager and mock platform."""
+        # The manager must not read or write the scheduled posts file, start
+        # the configured platforms, register real jobs or report analytics
+        patch.object(SocialMediaManager, '_initialize_platforms').start()
+        patch.object(SocialMediaManager, 'load_scheduled_posts').start()
+        patch.object(SocialMediaManager, 'save_scheduled_posts').start()
+        self.schedule = MagicMock()
+        patch('automation_stack.social_media.manager.schedule', self.schedule).start()
+        # Retries import schedule again inside _post_to_platform
+        patch.dict('sys.modules', {'schedule': self.schedule}).start()
+        patch('requests.post').start()
+        self.addCleanup(patch.stopall)
+        
+        # A fresh manager keeps scheduled posts and registered platforms from
+        # leaking between tests; only the fixtures are shared
+        self.manager = SocialMediaManager()
+        
+        # Register mock platform
+        self.mock_platform = MockPlatform()
+        self.manager.register_platform("mock", self.mock_platform)
     
     def test_schedule_post(self):
         """Test scheduling a new post."""
         post_data = self.test_posts[0]
-        post_id = self.manager.schedule_post(
-            platform=post_data["platform"],
-            content=post_data["content"],
-            scheduled_time=post_data["scheduled_time"]
-        )
+        post = self.manager.schedule_post(**post_data)
         
-        # Verify post was added to the database
-        post = self.manager.get_post(post_id)
-        self.assertEqual(post["content"], post_data["content"])
+        # Verify post was added to the scheduled posts
         self.assertEqual(post["status"], "scheduled")
+        self.assertEqual(post["scheduled_time"], self._ref + timedelta(minutes=5))
+        self.assertEqual(self.manager.get_scheduled_posts(status="scheduled"), [post])
+        self.assertEqual(post["caption"], post_data["caption"])
     
-    def test_process_scheduled_posts(self):
-        """Test processing of scheduled posts."""
-        # Add test posts to the database
-        for post in self.test_posts:
-            self.manager.schedule_post(
-                platform=post["platform"],
-                content=post["content"],
-                scheduled_time=post["scheduled_time"]
-            )
-        
-        # Process scheduled posts
-        with patch('automation_stack.manager.datetime') as mock_datetime:
-            mock_datetime.utcnow.return_value = datetime.utcnow()
-            processed = self.manager.process_scheduled_posts()
+    def test_scheduled_job_posts_to_platform(self):
+        """Test that the job registered for a scheduled post publishes it."""
+        self.manager.schedule_post(**self.test_posts[1])
         
-        # Verify one post was processed (the one in the past)
-        self.assertEqual(processed, 1)
-        
-        # Verify the post was marked as posted
-        posts = self.manager.get_posts(status="posted")
-        self.assertEqual(len(posts), 1)
-        self.assertEqual(posts[0]["content"], "Test post 2")
+        # The job runs daily at the post's time
+        at = self.schedule.every.return_value.day.at
+        at.assert_called_once_with("08:55")
+        job, = at.return_value.do.call_args.args
+        result = job(**at.return_value.do.call_args.kwargs)
         
         # Verify the platform's post method was called
-        self.assertEqual(len(self.mock_platform.posted_content), 1)
-        self.assertEqual(self.mock_platform.posted_content[0], "Test post 2")
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(self.mock_platform.posted_content, ["Test post 2"])
     
-    def test_cancel_post(self):
-        """Test canceling a scheduled post."""
-        # Schedule a post
-        post_id = self.manager.schedule_post(
-            platform="mock",
-            content="Test post to cancel",
-            scheduled_time=(datetime.utcnow() + timedelta(hours=1)).isoformat()
+    def test_get_scheduled_posts_filters(self):
+        """Test filtering scheduled posts by platform and status."""
+        self.manager.register_platform("other", MockPlatform())
+        for post in self.test_posts:
+            self.manager.schedule_post(**post)
+        self.manager.schedule_post(
+            platform_name="other",
+            content_path="/tmp/other.jpg",
+            caption="Other post",
+            post_time=self._ref.isoformat()
         )
         
-        # Cancel the post
-        self.assertTrue(self.manager.cancel_post(post_id))
-        
-        # Verify the post was marked as canceled
-        post = self.manager.get_post(post_id)
-        self.assertEqual(post["status"], "canceled")
+        captions = [p["caption"] for p in self.manager.get_scheduled_posts(platform="MOCK")]
+        self.assertEqual(captions, ["Test post 1", "Test post 2"])
+        self.assertEqual(len(self.manager.get_scheduled_posts(status="scheduled")), 3)
+        self.assertEqual(self.manager.get_scheduled_posts(status="failed"), [])
     
-    @patch('automation_stack.manager.SocialMediaManager._notify')
+    @patch('automation_stack.email_utils.send_failure_notification')
     def test_error_handling(self, mock_notify):
-        """Test error handling during post processing."""
+        """Test error handling during posting."""
         # Create a failing platform
         class FailingPlatform(MockPlatform):
-            def post(self, content, **kwargs):
+            def post(self, content_path, caption, **kwargs):
                 raise Exception("Posting failed")
         
-        failing_platform = FailingPlatform()
-        self.manager.register_platform("failing", failing_platform)
+        self.manager.register_platform("failing", FailingPlatform())
         
         # Schedule a post that will fail
-        post_id = self.manager.schedule_post(
-            platform="failing",
-            content="This will fail",
-            scheduled_time=(datetime.utcnow() - timedelta(minutes=5)).isoformat()
+        post = self.manager.schedule_post(
+            platform_name="failing",
+            content_path="/tmp/fail.jpg",
+            caption="This will fail",
+            post_time=(self._ref - timedelta(minutes=5)).isoformat()
         )
         
-        # Process the post
-        with self.assertLogs(level='ERROR') as log:
-            processed = self.manager.process_scheduled_posts()
+        # Post it until the retries are used up
+        with self.assertLogs('social_media.manager', level='ERROR') as log:
+            # Skip rendering the expected tracebacks
+            for handler in logging.getLogger('social_media.manager').handlers:
+                handler.addFilter(_NoExcInfo())
+            for attempt in range(SocialMediaManager.MAX_RETRIES + 1):
+                result = self.manager._post_to_platform(
+                    platform_name="failing",
+                    content_path="/tmp/fail.jpg",
+                    caption="This will fail"
+                )
+                self.assertEqual(result["status"], "error")
+                if attempt == 0:
+                    # Verify a retry was scheduled first
+                    self.assertEqual(post["status"], "retrying")
+                    self.assertEqual(post["retry_count"], 1)
         
         # Verify error was logged and notification was sent
-        self.assertIn("Failed to post", "".join(log.output))
+        self.assertIn("Error posting to failing: Posting failed", "".join(log.output))
         mock_notify.assert_called_once()
         
         # Verify post was marked as failed
-        post = self.manager.get_post(post_id)
         self.assertEqual(post["status"], "failed")
-        self.assertIn("Posting failed", post.get("error", ""))
+        self.assertEqual(post["retry_count"], SocialMediaManager.MAX_RETRIES + 1)
 
 if __name__ == "__main__":
     unittest.main()
@@ -6,20 +6,28 @@ This script automates the installation and configuration of various analytics to
 for the Encompass MSP WordPress site, including monitoring and reporting setup.
 """
 import os
+import re
 import sys
 import json
 import time
-import smtplib
-import schedule
-from datetime import datetime, timedelta
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import copy
+import random
+import atexit
+from datetime import datetime, timedelta, timezone
 import requests
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Set, Tuple, Any, TYPE_CHECKING
 import subprocess
 import logging
 
+from wp_utils import atomic_write_json, load_json_cached
+
+# schedule, smtplib and email.mime are imported where they are used so that
+# importing AnalyticsConfig alone stays cheap
+if TYPE_CHECKING:
+    import smtplib
+    from email.message import Message
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,6 +39,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
 class AnalyticsConfig:
     """Configuration for analytics tools."""
     
@@ -81,8 +90,9 @@ class AnalyticsConfig:
         
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r') as f:
-                    return {**default_config, **json.load(f)}
+                loaded = load_json_cached(str(self.config_file), self.config_file.stat().st_mtime_ns)
+                # Copy so callers mutating the config don't alter the cached entry
+                return {**default_config, **copy.deepcopy(loaded)}
             except json.JSONDecodeError:
                 logger.warning("Invalid config file. Using default configuration.")
         
@@ -92,121 +102,413 @@ class AnalyticsConfig:
         """Save configuration to file."""
         with open(self.config_file, 'w') as f:
             json.dump(self.config, f, indent=2)
+        load_json_cached.cache_clear()
         logger.info(f"Configuration saved to {self.config_file}")
 
 
-class AnalyticsMonitor:
-    """Monitors analytics implementation and sends alerts."""
+class SMTPSession:
+    """SMTP connection shared by alerts and reports, opened on first use."""
     
     def __init__(self, config: AnalyticsConfig):
         """Initialize with configuration."""
         self.config = config
+        self._conn: Optional['smtplib.SMTP'] = None
+    
+    def _connect(self) -> None:
+        """Open, secure and authenticate a new SMTP connection."""
+        import smtplib
+        
+        settings = self.config.config['monitoring']
+        server = smtplib.SMTP(settings['smtp_server'], settings['smtp_port'])
+        server.starttls()
+        server.login(settings['smtp_username'], settings['smtp_password'])
+        self._conn = server
+    
+    def send(self, msg: 'Message') -> None:
+        """Send a message, reconnecting if the server dropped the connection."""
+        import smtplib
+        
+        if self._conn is not None:
+            try:
+                self._conn.noop()
+            except (smtplib.SMTPException, OSError):
+                self.close()
+        
+        if self._conn is None:
+            self._connect()
+        
+        try:
+            self._conn.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            self._connect()
+            self._conn.send_message(msg)
+    
+    def close(self) -> None:
+        """Close the connection if one is open."""
+        import smtplib
+        
+        if self._conn is None:
+            return
+        try:
+            self._conn.quit()
+        except (smtplib.SMTPException, OSError):
+            # quit() leaves the socket open when the server is already gone
+            self._conn.close()
+        self._conn = None
+
+
+class AnalyticsMonitor:
+    """Monitors analytics implementation and sends alerts."""
+    
+    # Seconds to wait on the homepage before giving up, so a hung site
+    # cannot stall the scheduler loop
+    HOMEPAGE_TIMEOUT = 30
+    
+    # Size of the pieces the homepage is read and scanned in
+    HOMEPAGE_CHUNK_SIZE = 65536
+    
+    # A saved check younger than this makes the startup check unnecessary
+    STATE_TTL = timedelta(hours=6)
+    
+    # Monitoring data kept across restarts; alerts belong to a single check
+    PERSISTED_KEYS = ('last_check', 'metrics', 'alert_history')
+    
+    def __init__(
+        self,
+        config: AnalyticsConfig,
+        smtp: Optional[SMTPSession] = None,
+        state_file: str = 'analytics_state.json'
+    ):
+        """Initialize with configuration, an optional shared SMTP session and a state file."""
+        self.config = config
+        self.smtp = smtp or SMTPSession(config)
         self.monitoring_data = {
             'last_check': None,
             'alerts': [],
-            'metrics': {}
+            'metrics': {},
+            # Alerts still open since an earlier check, by "level:message"
+            'alert_history': {}
         }
+        
+        # Monitoring state survives restarts in this file
+        self._state_path = Path(state_file)
+        self._load_state()
+        
+        # Keep-alive session and conditional-request state for the homepage
+        self._session = requests.Session()
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._cached_found: Optional[Set[str]] = None
+        
+        # Tracking IDs the current matcher was built from
+        self._tracking_ids: Optional[Tuple[str, str, str, str]] = None
+        self._build_matcher()
     
     def check_analytics_implementation(self) -> bool:
         """Check if analytics are properly implemented."""
-        self.monitoring_data['last_check'] = datetime.utcnow().isoformat()
+        # One timestamp for the whole check, shared by every alert it raises
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self.monitoring_data['last_check'] = now
         
-        # Check GA4 implementation
-        if self.config.config['google']['ga4_property_id']:
-            self._check_ga4_implementation()
+        # Alerts describe this check only; earlier ones were already reported
+        self.monitoring_data['alerts'] = []
         
-        # Check GTM implementation
-        if self.config.config['google']['gtm_id']:
-            self._check_gtm_implementation()
+        # Rebuild the needles only if the tracking IDs were changed
+        if self._current_tracking_ids() != self._tracking_ids:
+            self._build_matcher()
         
-        # Check other analytics tools
-        self._check_other_analytics()
+        # Scan the homepage once and share the result between all checks
+        try:
+            found = self._scan_homepage()
+        except Exception as e:
+            logger.error(f"Error fetching homepage: {e}")
+            self.monitoring_data['alerts'].append({
+                'level': 'error',
+                'message': f'Error fetching homepage: {str(e)}',
+                'timestamp': now
+            })
+            found = None
         
-        # Send alerts if needed
-        if self.monitoring_data['alerts'] and self.config.config['monitoring']['email_alerts']:
-            self._send_alerts()
+        if found is not None:
+            checks = []
+            
+            # Check GA4 implementation
+            if self._tracked['ga4']:
+                checks.append(self._check_ga4_implementation)
+            
+            # Check GTM implementation
+            if self._tracked['gtm']:
+                checks.append(self._check_gtm_implementation)
+            
+            # Check other analytics tools
+            checks.append(self._check_other_analytics)
+            
+            # The checks only look up tags in the shared scan result, so running
+            # them in order is cheap and keeps alerts in a stable order
+            for check in checks:
+                metrics, alerts = check(found, now)
+                self.monitoring_data['metrics'].update(metrics)
+                self.monitoring_data['alerts'].extend(alerts)
+        
+        new_alerts = self._update_alert_history(now)
+        self._save_state()
+        
+        # Send alerts if needed; ones already mailed by an earlier check are not repeated
+        if new_alerts and self.config.config['monitoring']['email_alerts']:
+            self._send_alerts(new_alerts, now)
         
         return len(self.monitoring_data['alerts']) == 0
     
-    def _check_ga4_implementation(self) -> None:
-        """Check GA4 implementation."""
+    def _update_alert_history(self, now: str) -> List[Dict[str, Any]]:
+        """
+        Record this check's alerts in the alert history and return the new ones.
+        
+        An alert raised by consecutive checks keeps one history entry, counting
+        the checks it was seen in. Alerts this check did not raise are dropped,
+        so if one comes back it is reported as new again.
+        """
+        history = self.monitoring_data['alert_history']
+        current = {}
+        new_alerts = []
+        for alert in self.monitoring_data['alerts']:
+            key = f"{alert['level']}:{alert['message']}"
+            if key in current:
+                continue
+            entry = history.get(key)
+            if entry is None:
+                entry = {'first_seen': now, 'count': 0}
+                new_alerts.append(alert)
+            entry['count'] += 1
+            entry['last_seen'] = now
+            current[key] = entry
+        self.monitoring_data['alert_history'] = current
+        return new_alerts
+    
+    def seconds_until_check_due(self) -> float:
+        """Return how long until the saved check is STATE_TTL old; 0 if a check is due now."""
+        last_check = self.monitoring_data['last_check']
+        if not last_check:
+            return 0
+        try:
+            last_check = datetime.fromisoformat(last_check)
+        except ValueError:
+            return 0
+        # State written before checks were timezone-aware holds naive UTC times
+        if last_check.tzinfo is None:
+            last_check = last_check.replace(tzinfo=timezone.utc)
+        due = last_check + self.STATE_TTL - datetime.now(timezone.utc)
+        return max(due.total_seconds(), 0)
+    
+    def _load_state(self) -> None:
+        """Load monitoring data saved by a previous run, if any."""
+        if not self._state_path.exists():
+            return
+        try:
+            with open(self._state_path, 'r') as f:
+                saved = json.load(f)
+            self.monitoring_data.update(
+                (key, saved[key]) for key in self.PERSISTED_KEYS if key in saved
+            )
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load monitoring state from {self._state_path}: {e}")
+    
+    def _save_state(self) -> None:
+        """Persist monitoring data so a restart resumes where it left off."""
+        try:
+            state = {key: self.monitoring_data[key] for key in self.PERSISTED_KEYS}
+            atomic_write_json(self._state_path, state)
+        except OSError as e:
+            logger.error(f"Error saving monitoring state to {self._state_path}: {e}")
+    
+    def _scan_homepage(self) -> Set[str]:
+        """
+        Stream the homepage through the matcher and return the tags found.
+        
+        Reading stops as soon as every tag has been seen, and the result is
+        reused when the server reports the page as unchanged.
+        """
+        headers = {}
+        if self._cached_found is not None:
+            if self._etag:
+                headers['If-None-Match'] = self._etag
+            if self._last_modified:
+                headers['If-Modified-Since'] = self._last_modified
+        
+        with self._session.get(
+            self.config.config['wordpress']['url'],
+            headers=headers,
+            timeout=self.HOMEPAGE_TIMEOUT,
+            stream=True
+        ) as response:
+            if response.status_code == 304 and self._cached_found is not None:
+                return self._cached_found
+            
+            if response.encoding is None:
+                response.encoding = 'utf-8'
+            
+            all_tags = set(self._needle_tags.values())
+            found = set()
+            tail = ''
+            for chunk in response.iter_content(self.HOMEPAGE_CHUNK_SIZE, decode_unicode=True):
+                # Carry over the end of the previous chunk so needles that
+                # straddle a chunk boundary are still matched
+                text = tail + chunk
+                found |= self._scan(text)
+                if found >= all_tags:
+                    break
+                tail = text[-self._needle_overlap:] if self._needle_overlap else ''
+            
+            self._etag = response.headers.get('ETag')
+            self._last_modified = response.headers.get('Last-Modified')
+        
+        self._cached_found = found
+        return found
+    
+    def _current_tracking_ids(self) -> Tuple[str, str, str, str]:
+        """Return the configured GA4, GTM, Clarity and Hotjar IDs."""
+        config = self.config.config
+        return (
+            config['google']['ga4_property_id'],
+            config['google']['gtm_id'],
+            config['microsoft']['clarity_id'],
+            config['hotjar']['site_id']
+        )
+    
+    def _build_matcher(self) -> None:
+        """Compile the needles of every tracked tool into one pattern so the page is scanned once."""
+        self._tracking_ids = self._current_tracking_ids()
+        ga4_id, gtm_id, clarity_id, hotjar_id = self._tracking_ids
+        self._tracked = {
+            'ga4': bool(ga4_id),
+            'gtm': bool(gtm_id),
+            'clarity': bool(clarity_id),
+            'hotjar': bool(hotjar_id)
+        }
+        
+        # A cached scan result only applies to the needles it was made with
+        self._cached_found = None
+        
+        # (text, tag) pairs; Hotjar is matched case-insensitively
+        needles = []
+        if ga4_id:
+            needles.append(('gtag', 'gtag'))
+            needles.append(('config', 'config'))
+        if gtm_id:
+            needles.append((f'GTM-{gtm_id}', 'gtm'))
+            needles.append((f'gtm.js?id={gtm_id}', 'gtm'))
+        if clarity_id:
+            needles.append(('clarity.ms/sync', 'clarity'))
+            needles.append(('c.clarity.ms', 'clarity'))
+        if hotjar_id:
+            needles.append(('hotjar', 'hotjar'))
+        
+        # Characters to carry between streamed chunks; see _scan_homepage
+        self._needle_overlap = max((len(text) for text, _ in needles), default=1) - 1
+        
+        # One named group per needle; the group name maps a match back to its tag
+        patterns = []
+        self._needle_tags = {}
+        for i, (text, tag) in enumerate(needles):
+            pattern = re.escape(text)
+            if tag == 'hotjar':
+                pattern = f'(?i:{pattern})'
+            patterns.append(f'(?P<n{i}>{pattern})')
+            self._needle_tags[f'n{i}'] = tag
+        self._matcher = re.compile('|'.join(patterns)) if patterns else None
+    
+    def _scan(self, home_html: str) -> Set[str]:
+        """Return the tags of all needles present in the page."""
+        if self._matcher is None:
+            return set()
+        return {self._needle_tags[match.lastgroup] for match in self._matcher.finditer(home_html)}
+    
+    def _check_ga4_implementation(self, found: Set[str], now: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Check GA4 implementation. Returns the metrics and alerts found."""
+        metrics, alerts = {}, []
         try:
             # This is a simplified check - in a real implementation, you would
             # verify the GA4 tracking code is present on the page
-            home_page = requests.get(self.config.config['wordpress']['url'])
-            has_ga4 = 'gtag' in home_page.text and 'config' in home_page.text
+            has_ga4 = 'gtag' in found and 'config' in found
             
             if not has_ga4:
-                self.monitoring_data['alerts'].append({
+                alerts.append({
                     'level': 'error',
                     'message': 'GA4 tracking code not detected on homepage',
-                    'timestamp': datetime.utcnow().isoformat()
+                    'timestamp': now
                 })
             
-            self.monitoring_data['metrics']['ga4_implemented'] = has_ga4
+            metrics['ga4_implemented'] = has_ga4
             
         except Exception as e:
             logger.error(f"Error checking GA4 implementation: {e}")
-            self.monitoring_data['alerts'].append({
+            alerts.append({
                 'level': 'error',
                 'message': f'Error checking GA4 implementation: {str(e)}',
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': now
             })
+        
+        return metrics, alerts
     
-    def _check_gtm_implementation(self) -> None:
-        """Check GTM implementation."""
+    def _check_gtm_implementation(self, found: Set[str], now: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Check GTM implementation. Returns the metrics and alerts found."""
+        metrics, alerts = {}, []
         try:
-            home_page = requests.get(self.config.config['wordpress']['url'])
-            gtm_id = self.config.config['google']['gtm_id']
-            has_gtm = f'GTM-{gtm_id}' in home_page.text or f'gtm.js?id={gtm_id}' in home_page.text
+            has_gtm = 'gtm' in found
             
             if not has_gtm:
-                self.monitoring_data['alerts'].append({
+                alerts.append({
                     'level': 'warning',
                     'message': 'Google Tag Manager code not detected on homepage',
-                    'timestamp': datetime.utcnow().isoformat()
+                    'timestamp': now
                 })
             
-            self.monitoring_data['metrics']['gtm_implemented'] = has_gtm
+            metrics['gtm_implemented'] = has_gtm
             
         except Exception as e:
             logger.error(f"Error checking GTM implementation: {e}")
+        
+        return metrics, alerts
     
-    def _check_other_analytics(self) -> None:
-        """Check other analytics implementations."""
+    def _check_other_analytics(self, found: Set[str], now: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Check other analytics implementations. Returns the metrics and alerts found."""
+        metrics, alerts = {}, []
         try:
-            home_page = requests.get(self.config.config['wordpress']['url']).text
-            
             # Check Microsoft Clarity
-            if self.config.config['microsoft']['clarity_id']:
-                has_clarity = f'clarity.ms/sync' in home_page or f'c.clarity.ms' in home_page
-                self.monitoring_data['metrics']['clarity_implemented'] = has_clarity
+            if self._tracked['clarity']:
+                has_clarity = 'clarity' in found
+                metrics['clarity_implemented'] = has_clarity
                 if not has_clarity:
-                    self.monitoring_data['alerts'].append({
+                    alerts.append({
                         'level': 'warning',
                         'message': 'Microsoft Clarity tracking not detected',
-                        'timestamp': datetime.utcnow().isoformat()
+                        'timestamp': now
                     })
             
             # Check Hotjar
-            if self.config.config['hotjar']['site_id']:
-                has_hotjar = 'hotjar' in home_page.lower()
-                self.monitoring_data['metrics']['hotjar_implemented'] = has_hotjar
+            if self._tracked['hotjar']:
+                has_hotjar = 'hotjar' in found
+                metrics['hotjar_implemented'] = has_hotjar
                 if not has_hotjar:
-                    self.monitoring_data['alerts'].append({
+                    alerts.append({
                         'level': 'warning',
                         'message': 'Hotjar tracking not detected',
-                        'timestamp': datetime.utcnow().isoformat()
+                        'timestamp': now
                     })
             
         except Exception as e:
             logger.error(f"Error checking other analytics: {e}")
+        
+        return metrics, alerts
     
-    def _send_alerts(self) -> None:
-        """Send email alerts for any issues found."""
+    def _send_alerts(self, alerts: List[Dict[str, Any]], now: str) -> None:
+        """Send email alerts for the issues a check found at now."""
         if not self.config.config['monitoring']['email_alerts']:
             return
         
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        
         try:
             msg = MIMEMultipart()
             msg['From'] = self.config.config['monitoring']['smtp_username']
@@ -214,30 +516,29 @@ class AnalyticsMonitor:
             msg['Subject'] = 'Analytics Monitoring Alert'
             
             # Create email body
-            body = "Analytics Monitoring Alert\n\n"
-            body += f"Time: {datetime.utcnow().isoformat()}\n"
-            body += f"Site: {self.config.config['wordpress']['url']}\n\n"
+            lines = [
+                "Analytics Monitoring Alert",
+                "",
+                f"Time: {now}",
+                f"Site: {self.config.config['wordpress']['url']}",
+                ""
+            ]
             
-            if self.monitoring_data['alerts']:
-                body += "Issues Found:\n"
-                for alert in self.monitoring_data['alerts']:
-                    body += f"- [{alert['level'].upper()}] {alert['message']} ({alert['timestamp']})\n"
+            if alerts:
+                lines.append("Issues Found:")
+                lines.extend(
+                    f"- [{alert['level'].upper()}] {alert['message']} ({alert['timestamp']})"
+                    for alert in alerts
+                )
             else:
-                body += "No issues detected.\n"
+                lines.append("No issues detected.")
+            
+            body = "\n".join(lines) + "\n"
             
             msg.attach(MIMEText(body, 'plain'))
             
             # Send email
-            with smtplib.SMTP(
-                self.config.config['monitoring']['smtp_server'],
-                self.config.config['monitoring']['smtp_port']
-            ) as server:
-                server.starttls()
-                server.login(
-                    self.config.config['monitoring']['smtp_username'],
-                    self.config.config['monitoring']['smtp_password']
-                )
-                server.send_message(msg)
+            self.smtp.send(msg)
             
             logger.info("Alert email sent successfully")
             
@@ -248,9 +549,10 @@ class AnalyticsMonitor:
 class AnalyticsReporter:
     """Generates and sends analytics reports."""
     
-    def __init__(self, config: AnalyticsConfig):
-        """Initialize with configuration."""
+    def __init__(self, config: AnalyticsConfig, smtp: Optional[SMTPSession] = None):
+        """Initialize with configuration and an optional shared SMTP session."""
         self.config = config
+        self.smtp = smtp or SMTPSession(config)
         self.report_data = {
             'generated_at': None,
             'period': {},
@@ -349,6 +651,9 @@ class AnalyticsReporter:
     
     def _send_report(self, subject: str) -> None:
         """Send the generated report via email."""
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        
         try:
             msg = MIMEMultipart()
             msg['From'] = self.config.config['monitoring']['smtp_username']
@@ -356,54 +661,44 @@ class AnalyticsReporter:
             msg['Subject'] = f"{subject} - {datetime.utcnow().strftime('%Y-%m-%d')}"
             
             # Create email body
-            body = f"""{subject}
-            
-            Period: {self.report_data['period']['start']} to {self.report_data['period']['end']}
-            
-            Key Metrics:
-            - Sessions: {self.report_data['metrics']['sessions']:,}
-            - Users: {self.report_data['metrics']['users']:,}
-            - Pageviews: {self.report_data['metrics']['pageviews']:,}
-            - Bounce Rate: {self.report_data['metrics']['bounce_rate']}%
-            - Avg. Session Duration: {self.report_data['metrics']['avg_session_duration']} seconds
-            
-            Top Pages:"""
-            
-            for page in self.report_data['metrics']['top_pages']:
-                body += f"\n  - {page['page']}: {page['views']:,} views"
-            
-            body += """
+            metrics = self.report_data['metrics']
+            lines = [
+                subject,
+                "",
+                f"Period: {self.report_data['period']['start']} to {self.report_data['period']['end']}",
+                "",
+                "Key Metrics:",
+                f"- Sessions: {metrics['sessions']:,}",
+                f"- Users: {metrics['users']:,}",
+                f"- Pageviews: {metrics['pageviews']:,}",
+                f"- Bounce Rate: {metrics['bounce_rate']}%",
+                f"- Avg. Session Duration: {metrics['avg_session_duration']} seconds",
+                "",
+                "Top Pages:"
+            ]
+            lines.extend(f"  - {page['page']}: {page['views']:,} views" for page in metrics['top_pages'])
             
-            Traffic Sources:"""
-            
-            for source, percentage in self.report_data['metrics']['traffic_sources'].items():
-                body += f"\n  - {source.replace('_', ' ').title()}: {percentage}%"
+            lines.extend(["", "Traffic Sources:"])
+            lines.extend(
+                f"  - {source.replace('_', ' ').title()}: {percentage}%"
+                for source, percentage in metrics['traffic_sources'].items()
+            )
             
             if self.report_data['recommendations']:
-                body += """
-                
-                Recommendations:"""
-                for rec in self.report_data['recommendations']:
-                    body += f"\n                - {rec}"
-            
-            body += """
+                lines.extend(["", "Recommendations:"])
+                lines.extend(f"  - {rec}" for rec in self.report_data['recommendations'])
             
-            ---
-            This is an automated report. Please contact support if you have any questions."""
+            lines.extend([
+                "",
+                "---",
+                "This is an automated report. Please contact support if you have any questions."
+            ])
+            body = "\n".join(lines)
             
             msg.attach(MIMEText(body, 'plain'))
             
             # Send email
-            with smtplib.SMTP(
-                self.config.config['monitoring']['smtp_server'],
-                self.config.config['monitoring']['smtp_port']
-            ) as server:
-                server.starttls()
-                server.login(
-                    self.config.config['monitoring']['smtp_username'],
-                    self.config.config['monitoring']['smtp_password']
-                )
-                server.send_message(msg)
+            self.smtp.send(msg)
             
             logger.info(f"{subject} sent successfully")
             
@@ -411,29 +706,71 @@ class AnalyticsReporter:
             logger.error(f"Error sending {subject.lower()}: {e}")
 
 
+# Upper bound, in seconds, of the random offset applied to scheduled jobs so
+# several monitoring instances do not hit the site and SMTP server together
+SCHEDULE_JITTER = 600
+
+
+def _jittered(at: str) -> str:
+    """Return the HH:MM time shifted by a random per-process offset, as HH:MM:SS."""
+    offset = timedelta(seconds=random.randint(0, SCHEDULE_JITTER))
+    return (datetime.strptime(at, "%H:%M") + offset).strftime("%H:%M:%S")
+
+
 def setup_monitoring():
     """Set up monitoring schedule."""
+    import schedule
+    
     config = AnalyticsConfig()
-    monitor = AnalyticsMonitor(config)
-    reporter = AnalyticsReporter(config)
     
-    # Schedule monitoring checks (every 6 hours)
-    schedule.every(6).hours.do(monitor.check_analytics_implementation)
+    # One SMTP connection serves both alerts and reports
+    smtp = SMTPSession(config)
+    atexit.register(smtp.close)
+    
+    monitor = AnalyticsMonitor(config, smtp)
+    reporter = AnalyticsReporter(config, smtp)
+    
+    def schedule_checks():
+        """Schedule monitoring checks (every 6 hours, give or take the jitter)."""
+        check_interval = 6 * 60 * 60
+        schedule.every(check_interval - SCHEDULE_JITTER // 2).to(
+            check_interval + SCHEDULE_JITTER // 2
+        ).seconds.do(monitor.check_analytics_implementation)
+    
+    def first_check():
+        """Run the check a restart postponed, then start the regular interval from it."""
+        monitor.check_analytics_implementation()
+        schedule_checks()
+        return schedule.CancelJob
     
     # Schedule reports
-    schedule.every().day.at("08:00").do(reporter.generate_daily_report)
-    schedule.every().monday.at("09:00").do(reporter.generate_weekly_report)
-    schedule.every().day.at("10:00").do(
+    schedule.every().day.at(_jittered("08:00")).do(reporter.generate_daily_report)
+    schedule.every().monday.at(_jittered("09:00")).do(reporter.generate_weekly_report)
+    schedule.every().day.at(_jittered("10:00")).do(
         reporter.generate_monthly_report
     ).tag("monthly")
     
-    # Initial check
-    monitor.check_analytics_implementation()
+    # Initial check, unless a recent one was saved by the previous run; then the
+    # first check runs when that one is STATE_TTL old, not a full interval from now
+    delay = monitor.seconds_until_check_due()
+    if delay == 0:
+        monitor.check_analytics_implementation()
+        schedule_checks()
+    else:
+        logger.info(
+            f"Skipping initial check; last check was at {monitor.monitoring_data['last_check']}, "
+            f"next in {delay / 3600:.1f}h"
+        )
+        schedule.every(round(delay)).seconds.do(first_check)
     
-    # Run scheduled tasks
+    # Run scheduled tasks, sleeping until the next one is due
     while True:
         schedule.run_pending()
-        time.sleep(60)  # Check every minute
+        idle_seconds = schedule.idle_seconds()
+        if idle_seconds is None:
+            break  # Nothing left to schedule
+        if idle_seconds > 0:
+            time.sleep(min(idle_seconds, 3600))
 
 
 if __name__ == "__main__":
@@ -8,11 +8,14 @@ and settings for the Encompass MSP WordPress site.
 import os
 import sys
 import json
-import subprocess
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+
+from wp_utils import WPCLI
 
 class WordPressConfig:
     """Configuration for WordPress site."""
@@ -24,6 +27,18 @@ class WordPressConfig:
         self.wp_password = wp_password
         self.wp_path = wp_path or os.getcwd()
         self.rest_url = f"{self.wp_url}/wp-json/wp/v2"
+        self.wp_cli = WPCLI(self.wp_path)
+        
+        # Pooled, authenticated session reused for every REST call
+        self.session = requests.Session()
+        self.session.auth = HTTPBasicAuth(self.wp_user, self.wp_password)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
         # Verify WordPress installation
         if not self.verify_wp_installation():
@@ -33,27 +48,19 @@ class WordPressConfig:
     def verify_wp_installation(self) -> bool:
         """Verify WordPress installation and credentials."""
         try:
-            response = requests.get(
-                f"{self.rest_url}/settings",
-                auth=HTTPBasicAuth(self.wp_user, self.wp_password)
-            )
+            # Headers are enough to see whether the settings endpoint accepted us
+            response = self.session.head(f"{self.rest_url}/settings", timeout=5, allow_redirects=True)
             return response.status_code == 200
         except requests.RequestException:
             return False
     
-    def run_wp_cli(self, command: str) -> Tuple[bool, str]:
-        """Run a WP-CLI command."""
-        try:
-            cmd = ["wp", "--path=\"" + self.wp_path + "\""] + command.split()
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return True, result.stdout
-        except subprocess.CalledProcessError as e:
-            return False, f"Error: {e.stderr}"
+    def run_wp_cli(self, *args: str) -> Tuple[bool, str]:
+        """Run a WP-CLI command given as separate arguments."""
+        return self.wp_cli.run(*args)
+    
+    def update_options(self, options: Dict[str, Any]) -> Tuple[bool, str]:
+        """Update several WordPress options with a single WP-CLI call."""
+        return self.wp_cli.update_options(options)
 
 
 class AnalyticsInstaller:
@@ -78,14 +85,16 @@ class AnalyticsInstaller:
         print("\n=== Installing Required Plugins ===")
         
         # Get list of installed plugins
-        success, output = self.wp.run_wp_cli("plugin list --format=json")
+        success, output = self.wp.run_wp_cli("plugin", "list", "--format=json")
         if not success:
             print(f"Error getting plugin list: {output}")
             return
         
         installed_plugins = {p['name']: p for p in json.loads(output)}
         
-        # Install and activate each required plugin
+        # Sort required plugins into those to install and those to activate
+        to_install = []
+        to_activate = []
         for plugin_slug in self.REQUIRED_PLUGINS:
             if plugin_slug in installed_plugins:
                 print(f"- {plugin_slug} is already installed")
@@ -93,17 +102,42 @@ class AnalyticsInstaller:
                 
                 # Check if plugin is active
                 if installed_plugins[plugin_slug]['status'] != 'active':
-                    self.activate_plugin(plugin_slug)
+                    to_activate.append(plugin_slug)
                 else:
                     self.plugins_activated.append(plugin_slug)
                     print(f"  ✓ {plugin_slug} is already active")
             else:
-                self.install_plugin(plugin_slug)
+                to_install.append(plugin_slug)
+        
+        # One WP-CLI call per step; fall back to per-plugin calls on failure so
+        # the plugin that broke the batch is reported individually
+        if to_install:
+            print(f"- Installing {', '.join(to_install)}...")
+            success, output = self.wp.run_wp_cli("plugin", "install", *to_install, "--activate")
+            if success:
+                for plugin_slug in to_install:
+                    print(f"  ✓ {plugin_slug} installed and activated")
+                self.plugins_installed.extend(to_install)
+                self.plugins_activated.extend(to_install)
+            else:
+                for plugin_slug in to_install:
+                    self.install_plugin(plugin_slug)
+        
+        if to_activate:
+            print(f"- Activating {', '.join(to_activate)}...")
+            success, output = self.wp.run_wp_cli("plugin", "activate", *to_activate)
+            if success:
+                for plugin_slug in to_activate:
+                    print(f"  ✓ {plugin_slug} activated")
+                self.plugins_activated.extend(to_activate)
+            else:
+                for plugin_slug in to_activate:
+                    self.activate_plugin(plugin_slug)
     
     def install_plugin(self, plugin_slug: str) -> None:
         """Install a WordPress plugin."""
         print(f"- Installing {plugin_slug}...")
-        success, output = self.wp.run_wp_cli(f"plugin install {plugin_slug} --activate")
+        success, output = self.wp.run_wp_cli("plugin", "install", plugin_slug, "--activate")
         
         if success:
             print(f"  ✓ {plugin_slug} installed and activated")
@@ -115,7 +149,7 @@ class AnalyticsInstaller:
     def activate_plugin(self, plugin_slug: str) -> None:
         """Activate a WordPress plugin."""
         print(f"- Activating {plugin_slug}...")
-        success, output = self.wp.run_wp_cli(f"plugin activate {plugin_slug}")
+        success, output = self.wp.run_wp_cli("plugin", "activate", plugin_slug)
         
         if success:
             print(f"  ✓ {plugin_slug} activated")
@@ -147,18 +181,23 @@ class AnalyticsInstaller:
             print("Yoast SEO is not activated. Please activate it first.")
             return
         
-        # Set site title and description
-        self.wp.run_wp_cli(f"option update blogname '{site_name}'")
-        self.wp.run_wp_cli(f"option update blogdescription '{site_description}'")
-        
-        # Enable XML sitemaps
-        self.wp.run_wp_cli("option update wpseo_xml '1'")
-        
-        # Disable author and search results sitemaps
-        self.wp.run_wp_cli("option update wpseo_titles 'noindex-author-wpseo' '1'")
-        self.wp.run_wp_cli("option update wpseo_titles 'noindex-search' '1'")
+        success, output = self.wp.update_options({
+            # Set site title and description
+            "blogname": site_name,
+            "blogdescription": site_description,
+            # Enable XML sitemaps
+            "wpseo_xml": "1",
+            # Disable author and search results sitemaps
+            "wpseo_titles": {
+                "noindex-author-wpseo": "1",
+                "noindex-search": "1"
+            }
+        })
         
-        print("✓ Basic SEO settings configured")
+        if success:
+            print("✓ Basic SEO settings configured")
+        else:
+            print(f"✗ Failed to configure Yoast SEO: {output}")
     
     def configure_hotjar(self, site_id: str) -> None:
         """Configure Hotjar tracking."""
@@ -169,10 +208,15 @@ class AnalyticsInstaller:
             return
         
         # Configure Hotjar site ID
-        self.wp.run_wp_cli(f"option update hotjar_site_id '{site_id}'")
-        self.wp.run_wp_cli("option update hotjar_snippet_version '6'")
+        success, output = self.wp.update_options({
+            "hotjar_site_id": site_id,
+            "hotjar_snippet_version": "6"
+        })
         
-        print(f"✓ Hotjar configured with Site ID: {site_id}")
+        if success:
+            print(f"✓ Hotjar configured with Site ID: {site_id}")
+        else:
+            print(f"✗ Failed to configure Hotjar: {output}")
 
 
 def main():
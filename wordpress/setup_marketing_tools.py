@@ -8,80 +8,205 @@ for the Encompass MSP WordPress site.
 import os
 import sys
 import json
-import subprocess
+import copy
+import time
+import functools
+import types
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('marketing_setup.log'),
-        logging.StreamHandler()
-    ]
-)
+from wp_utils import WPCLI, atomic_write_json, load_json_cached
+
+try:
+    import orjson  # Optional; writes the config faster than json
+except ImportError:
+    orjson = None
+
+# Logging is configured in main(), so importing this module opens no log file
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Page content lives next to this script so it is only read when pages are created
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'templates'
+
+
+@functools.lru_cache(maxsize=None)
+def _tpl(name: str) -> str:
+    """Read a page template from TEMPLATE_DIR once."""
+    return (TEMPLATE_DIR / name).read_text(encoding='utf-8')
+
+
+# Pages created by create_marketing_pages; content comes from TEMPLATE_DIR
+_MARKETING_PAGES = (
+    {
+        'title': 'Free IT Consultation',
+        'content_file': 'consultation.html',
+        'status': 'publish',
+        'meta': {
+            '_yoast_wpseo_title': 'Free IT Consultation | {site_title}',
+            '_yoast_wpseo_metadesc': 'Schedule your free 30-minute IT consultation today. Our experts will analyze your current setup and provide actionable recommendations.'
+        }
+    },
+    {
+        'title': 'Case Studies',
+        'content_file': 'case_studies.html',
+        'status': 'publish'
+    },
+    {
+        'title': 'Resources',
+        'content_file': 'resources.html',
+        'status': 'publish'
+    }
+)
+
+# Contact form set up by setup_forms
+_CONTACT_FORM = types.MappingProxyType({
+    'title': 'Contact Us',
+    'fields': [
+        {'type': 'text', 'name': 'your-name', 'label': 'Name', 'required': True},
+        {'type': 'email', 'name': 'your-email', 'label': 'Email', 'required': True},
+        {'type': 'tel', 'name': 'your-phone', 'label': 'Phone'},
+        {'type': 'select', 'name': 'service', 'label': 'Service Interested In', 'options': ['Managed IT', 'Digital Marketing', 'Web Development', 'Other']},
+        {'type': 'textarea', 'name': 'your-message', 'label': 'Message'}
+    ],
+    'settings': {
+        'mail': {
+            'active': True,
+            'to': '[your-email]',
+            'subject': 'New contact form submission from [your-name]'
+        },
+        'messages': {
+            'mail_sent_ok': 'Thank you for your message. We will be in touch soon!'
+        }
+    }
+})
+
+
+@dataclass(frozen=True, slots=True)
+class WordPressSettings:
+    """WordPress site access."""
+    url: str = ''
+    admin_user: str = ''
+    admin_password: str = ''
+    path: str = ''
+    parallel_installs: int = 8
+
+
+@dataclass(frozen=True, slots=True)
+class EmailMarketingSettings:
+    """Email marketing provider settings."""
+    provider: str = 'mailchimp'  # or 'activecampaign', 'convertkit', etc.
+    api_key: str = ''
+    list_id: str = ''
+    enable_drip_campaigns: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class SeoSettings:
+    """SEO plugin toggles."""
+    enable_yoast: bool = True
+    enable_redirection: bool = True
+    enable_seo_framework: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class SocialMediaSettings:
+    """Social media pixels and auto-posting."""
+    facebook_pixel_id: str = ''
+    twitter_pixel_id: str = ''
+    linkedin_pixel_id: str = ''
+    enable_auto_posting: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class ConversionSettings:
+    """Conversion optimization toggles."""
+    enable_ab_testing: bool = True
+    enable_exit_intent: bool = True
+    enable_heatmaps: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class CrmSettings:
+    """CRM integration settings."""
+    enable_crm: bool = False
+    crm_provider: str = 'none'  # 'none', 'hubspot', 'salesforce', etc.
+
 
 class MarketingConfig:
     """Configuration for marketing tools."""
     
+    # Config file section -> (attribute, settings class)
+    SECTIONS = {
+        'wordpress': ('wordpress', WordPressSettings),
+        'email_marketing': ('email', EmailMarketingSettings),
+        'seo': ('seo', SeoSettings),
+        'social_media': ('social', SocialMediaSettings),
+        'conversion': ('conversion', ConversionSettings),
+        'crm': ('crm', CrmSettings)
+    }
+    
+    wordpress: WordPressSettings
+    email: EmailMarketingSettings
+    seo: SeoSettings
+    social: SocialMediaSettings
+    conversion: ConversionSettings
+    crm: CrmSettings
+    
     def __init__(self, config_file: str = 'marketing_config.json'):
         """Initialize with configuration file."""
         self.config_file = Path(config_file)
-        self.config = self._load_config()
-    
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from file or create default."""
-        default_config = {
-            'wordpress': {
-                'url': '',
-                'admin_user': '',
-                'admin_password': '',
-                'path': ''
-            },
-            'email_marketing': {
-                'provider': 'mailchimp',  # or 'activecampaign', 'convertkit', etc.
-                'api_key': '',
-                'list_id': '',
-                'enable_drip_campaigns': True
-            },
-            'seo': {
-                'enable_yoast': True,
-                'enable_redirection': True,
-                'enable_seo_framework': False
-            },
-            'social_media': {
-                'facebook_pixel_id': '',
-                'twitter_pixel_id': '',
-                'linkedin_pixel_id': '',
-                'enable_auto_posting': True
-            },
-            'conversion': {
-                'enable_ab_testing': True,
-                'enable_exit_intent': True,
-                'enable_heatmaps': True
-            },
-            'crm': {
-                'enable_crm': False,
-                'crm_provider': 'none'  # 'none', 'hubspot', 'salesforce', etc.
-            }
-        }
         
+        # Settings this script does not use, such as the analytics section,
+        # kept so save_config writes them back unchanged
+        self.extra: Dict[str, Any] = {}
+        
+        for section, values in self._load_config().items():
+            attr, settings_cls = self.SECTIONS[section]
+            setattr(self, attr, settings_cls(**values))
+    
+    def _load_config(self) -> Dict[str, Dict[str, Any]]:
+        """Load configuration from file, filling in defaults per section."""
+        user_config = {}
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r') as f:
-                    return {**default_config, **json.load(f)}
+                resolved = self.config_file.resolve()
+                user_config = load_json_cached(str(resolved), resolved.stat().st_mtime_ns)
             except json.JSONDecodeError:
                 logger.warning("Invalid config file. Using default configuration.")
         
-        return default_config
+        # Merge each section separately so a partial section keeps its other defaults
+        config = {}
+        for section, (_, settings_cls) in self.SECTIONS.items():
+            values = asdict(settings_cls())
+            for key, value in user_config.get(section, {}).items():
+                if key in values:
+                    values[key] = value
+                else:
+                    self.extra.setdefault(section, {})[key] = copy.deepcopy(value)
+            config[section] = values
+        
+        for section, value in user_config.items():
+            if section not in self.SECTIONS:
+                self.extra[section] = copy.deepcopy(value)
+        return config
     
     def save_config(self) -> None:
         """Save configuration to file."""
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        config = {
+            section: {**asdict(getattr(self, attr)), **self.extra.get(section, {})}
+            for section, (attr, _) in self.SECTIONS.items()
+        }
+        for section, value in self.extra.items():
+            config.setdefault(section, value)
+        if orjson:
+            self.config_file.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        else:
+            self.config_file.write_text(json.dumps(config, indent=2))
+        load_json_cached.cache_clear()
         logger.info(f"Configuration saved to {self.config_file}")
 
 
@@ -91,130 +216,269 @@ class MarketingInstaller:
     def __init__(self, config: MarketingConfig):
         """Initialize with configuration."""
         self.config = config
-        self.wp_cli = self._get_wp_cli_command()
+        
+        # Sections are looked up once rather than in every step
+        self.wp_cfg = config.wordpress
+        self.email_cfg = config.email
+        self.seo_cfg = config.seo
+        self.social_cfg = config.social
+        self.conv_cfg = config.conversion
+        self.crm_cfg = config.crm
+        
+        self.wp_cli = WPCLI(self.wp_cfg.path)
+        
+        # IDs of the pages made by create_marketing_pages, for the menu
+        self.created_page_ids: List[int] = []
+        
+        # WordPress.org lookups remembered across runs
+        self._slug_cache = self._load_slug_cache()
     
-    def _get_wp_cli_command(self) -> str:
-        """Get the WP-CLI command with proper path."""
-        wp_path = self.config.config['wordpress'].get('path', '')
-        if wp_path:
-            return f"wp --path={wp_path}"
-        return "wp"
+    def run_wp_cli(self, *args: str) -> Tuple[bool, str]:
+        """Run a WP-CLI command given as separate arguments."""
+        return self.wp_cli.run(*args)
     
-    def run_wp_cli(self, command: str) -> Tuple[bool, str]:
-        """Run a WP-CLI command."""
-        try:
-            full_cmd = f"{self.wp_cli} {command}"
-            result = subprocess.run(
-                full_cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return True, result.stdout
-        except subprocess.CalledProcessError as e:
-            return False, f"{e.stderr}\nCommand: {e.cmd}"
+    def update_options(self, options: Dict[str, Any]) -> Tuple[bool, str]:
+        """Update several WordPress options with a single WP-CLI call."""
+        return self.wp_cli.update_options(options)
     
     def install_plugins(self) -> None:
         """Install required marketing plugins."""
         logger.info("Installing marketing plugins...")
         
-        # Base plugins
-        plugins = [
+        mailchimp = self.email_cfg.provider == 'mailchimp'
+        exit_intent = self.conv_cfg.enable_exit_intent
+        
+        # Plugins paired with whether the config enables the feature they serve
+        candidates = [
             # Email Marketing
-            'mailchimp-for-wp',
-            'mailchimp-for-woocommerce',
+            ('mailchimp-for-wp', mailchimp),
+            ('mailchimp-for-woocommerce', mailchimp),
             
             # SEO
-            'wordpress-seo',
-            'redirection',
-            'autodescription',  # The SEO Framework
+            ('wordpress-seo', self.seo_cfg.enable_yoast),
+            ('redirection', self.seo_cfg.enable_redirection),
+            ('autodescription', self.seo_cfg.enable_seo_framework),  # The SEO Framework
             
             # Social Media
-            'official-facebook-pixel',
-            'twitter',
-            'linkedin-pixel',
-            'revive-old-post',
+            ('official-facebook-pixel', bool(self.social_cfg.facebook_pixel_id)),
+            ('twitter', bool(self.social_cfg.twitter_pixel_id)),
+            ('linkedin-pixel', bool(self.social_cfg.linkedin_pixel_id)),
+            ('revive-old-post', self.social_cfg.enable_auto_posting),
             
             # Conversion Optimization
-            'google-optimize',
-            'optinmonster',
-            'thrive-leads',
+            ('google-optimize', self.conv_cfg.enable_ab_testing),
+            ('optinmonster', exit_intent),
+            ('thrive-leads', exit_intent),
             
             # Analytics
-            'google-site-kit',
-            'monsterinsights',
+            ('google-site-kit', True),
+            ('monsterinsights', True),
             
             # CRM
-            'contact-form-7',
-            'wpforms-lite',
-            'hubspot-crm'  # If using HubSpot
+            ('contact-form-7', True),
+            ('wpforms-lite', True),
+            ('hubspot-crm', self.crm_cfg.enable_crm
+                and self.crm_cfg.crm_provider.lower() == 'hubspot')
         ]
+        plugins = [slug for slug, enabled in candidates if enabled]
         
-        # Install and activate each plugin
+        # Plugins already on the site need at most an activation, not a download
+        installed = self._get_installed_plugins()
+        to_install = [p for p in plugins if p not in installed]
+        to_activate = []
         for plugin in plugins:
-            logger.info(f"Installing {plugin}...")
-            success, output = self.run_wp_cli(f"plugin install {plugin} --activate")
+            if installed.get(plugin) == 'active':
+                logger.info(f"✓ {plugin} is already installed and active")
+            elif plugin in installed:
+                to_activate.append(plugin)
+        
+        if to_activate:
+            success, output = self.run_wp_cli("plugin", "activate", *to_activate)
             if success:
+                for plugin in to_activate:
+                    logger.info(f"✓ {plugin} activated")
+            else:
+                logger.error(f"✗ Failed to activate {', '.join(to_activate)}: {output}")
+        
+        # Known-bad slugs would only fail after a round-trip to WordPress.org
+        to_install = self._validate_slugs(to_install)
+        if not to_install:
+            return
+        
+        # One WP-CLI call boots WordPress once for every plugin
+        logger.info(f"Installing {len(to_install)} plugins...")
+        success, output = self.run_wp_cli("plugin", "install", *to_install, "--activate")
+        if success:
+            for plugin in to_install:
                 logger.info(f"✓ {plugin} installed and activated")
+            return
+        
+        # Fall back to per-plugin installs so each failure is reported on its own
+        logger.warning(f"Batch install failed, installing plugins one by one: {output}")
+        self._install_plugins_individually(to_install)
+    
+    def _get_installed_plugins(self) -> Dict[str, str]:
+        """Map installed plugin slugs to their status; empty if the list is unavailable."""
+        success, output = self.run_wp_cli("plugin", "list", "--fields=name,status", "--format=json")
+        if not success:
+            logger.warning(f"Could not list installed plugins: {output}")
+            return {}
+        try:
+            return {p['name']: p['status'] for p in json.loads(output)}
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Unexpected plugin list output; installing all plugins")
+            return {}
+    
+    # Where slug lookups are remembered, and for how long (seconds)
+    SLUG_CACHE_PATH = Path.home() / '.cache' / 'wp-marketing-slugs.json'
+    SLUG_CACHE_TTL = 7 * 24 * 60 * 60
+    
+    def _load_slug_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load remembered slug lookups; empty if there are none."""
+        try:
+            return json.loads(self.SLUG_CACHE_PATH.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable slug cache {self.SLUG_CACHE_PATH}: {e}")
+            return {}
+    
+    def _save_slug_cache(self) -> None:
+        """Persist the slug cache for the next run."""
+        try:
+            atomic_write_json(self.SLUG_CACHE_PATH, self._slug_cache)
+        except OSError as e:
+            logger.warning(f"Could not save slug cache to {self.SLUG_CACHE_PATH}: {e}")
+    
+    # Looks up every slug in $data with the plugin directory API in one bootstrap.
+    # Prints {slug: true|false|null}; null means the lookup itself failed. A
+    # "Plugin not found." reply carries no error data, while request failures do.
+    CHECK_SLUGS_PHP = (
+        "require_once ABSPATH . 'wp-admin/includes/plugin-install.php'; "
+        "$found = []; "
+        "foreach ($data as $slug) { "
+        "$info = plugins_api('plugin_information', ['slug' => $slug, 'fields' => ['sections' => false]]); "
+        "$found[$slug] = !is_wp_error($info) ? true : ($info->get_error_data() ? null : false); } "
+        "echo json_encode($found);"
+    )
+    
+    def _validate_slugs(self, plugins: List[str]) -> List[str]:
+        """Drop plugins WordPress.org does not have, looking up only uncached slugs."""
+        now = time.time()
+        stale = [
+            slug for slug in plugins
+            if slug not in self._slug_cache
+            or now - self._slug_cache[slug]['checked'] > self.SLUG_CACHE_TTL
+        ]
+        
+        results: Dict[str, Optional[bool]] = {}
+        if stale:
+            success, output = self.wp_cli.eval_php(self.CHECK_SLUGS_PHP, stale)
+            try:
+                results = json.loads(output) if success else {}
+            except ValueError:
+                pass
+            if not success:
+                logger.warning(f"Could not check plugin slugs on WordPress.org: {output}")
+            
+            checked = {slug: exists for slug, exists in results.items() if exists is not None}
+            if checked:
+                self._slug_cache.update(
+                    (slug, {'exists': exists, 'checked': now}) for slug, exists in checked.items()
+                )
+                self._save_slug_cache()
+        
+        valid = []
+        for slug in plugins:
+            # A failed lookup leaves the slug unknown; let the install decide
+            exists = results.get(slug) if slug in stale else self._slug_cache[slug]['exists']
+            if exists is False:
+                logger.warning(f"✗ Skipping {slug}: not found on WordPress.org")
+            else:
+                valid.append(slug)
+        return valid
+    
+    def _install_plugins_individually(self, plugins: List[str]) -> None:
+        """Install plugins with one WP-CLI call each, then activate them together."""
+        # Downloads are independent, so install side by side
+        max_workers = min(self.wp_cfg.parallel_installs, len(plugins))
+        installed = []
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {}
+            for plugin in plugins:
+                logger.info(f"Installing {plugin}...")
+                futures[pool.submit(self.run_wp_cli, "plugin", "install", plugin)] = plugin
+            
+            for future in as_completed(futures):
+                plugin = futures[future]
+                success, output = future.result()
+                if success:
+                    logger.info(f"✓ {plugin} installed")
+                    installed.append(plugin)
+                else:
+                    logger.error(f"✗ Failed to install {plugin}: {output}")
+        
+        # Activation rewrites the active_plugins option, so it runs once for all
+        if installed:
+            success, output = self.run_wp_cli("plugin", "activate", *installed)
+            if success:
+                logger.info(f"✓ Activated {len(installed)} plugins")
             else:
-                logger.error(f"✗ Failed to install {plugin}: {output}")
+                logger.error(f"✗ Failed to activate plugins: {output}")
     
     def configure_email_marketing(self) -> None:
         """Configure email marketing settings."""
         logger.info("Configuring email marketing...")
-        email_config = self.config.config.get('email_marketing', {})
         
-        if email_config.get('provider') == 'mailchimp' and email_config.get('api_key'):
+        if self.email_cfg.provider == 'mailchimp' and self.email_cfg.api_key:
             logger.info("Configuring Mailchimp...")
             # This would be more complex in a real implementation
-            self.run_wp_cli("option update mailchimp_api_key '" + email_config['api_key'] + "'")
-            self.run_wp_cli("option update mailchimp_list_id '" + email_config.get('list_id', '') + "'")
+            success, output = self.update_options({
+                'mailchimp_api_key': self.email_cfg.api_key,
+                'mailchimp_list_id': self.email_cfg.list_id
+            })
+            if not success:
+                logger.error(f"✗ Failed to configure Mailchimp: {output}")
     
     def configure_seo(self) -> None:
         """Configure SEO settings."""
         logger.info("Configuring SEO...")
-        seo_config = self.config.config.get('seo', {})
         
-        if seo_config.get('enable_yoast', False):
+        if self.seo_cfg.enable_yoast:
             logger.info("Configuring Yoast SEO...")
             # Example configuration - would be more comprehensive in production
-            self.run_wp_cli("yoast index --mode=basic")
-            self.run_wp_cli("yoast setting set enable_xml_sitemap true")
+            self.run_wp_cli("yoast", "index", "--mode=basic")
+            self.run_wp_cli("yoast", "setting", "set", "enable_xml_sitemap", "true")
     
     def configure_social_media(self) -> None:
         """Configure social media integration."""
         logger.info("Configuring social media...")
-        social_config = self.config.config.get('social_media', {})
         
         # Facebook Pixel
-        if social_config.get('facebook_pixel_id'):
-            self.run_wp_cli(f"option update facebook_pixel_id {social_config['facebook_pixel_id']}")
+        if self.social_cfg.facebook_pixel_id:
+            self.run_wp_cli("option", "update", "facebook_pixel_id", self.social_cfg.facebook_pixel_id)
         
         # Auto-posting
-        if social_config.get('enable_auto_posting', False):
+        if self.social_cfg.enable_auto_posting:
             logger.info("Configuring auto-posting...")
             # This would involve more complex configuration in a real implementation
     
     def configure_conversion_tools(self) -> None:
         """Configure conversion optimization tools."""
         logger.info("Configuring conversion tools...")
-        conversion_config = self.config.config.get('conversion', {})
         
-        if conversion_config.get('enable_ab_testing', False):
+        if self.conv_cfg.enable_ab_testing:
             logger.info("Setting up A/B testing...")
             # Configure Google Optimize
             
-        if conversion_config.get('enable_exit_intent', False):
+        if self.conv_cfg.enable_exit_intent:
             logger.info("Configuring exit-intent popups...")
             # Configure OptinMonster or similar
     
     def setup_crm(self) -> None:
         """Set up CRM integration."""
-        crm_config = self.config.config.get('crm', {})
-        
-        if crm_config.get('enable_crm', False):
-            crm_provider = crm_config.get('crm_provider', '').lower()
+        if self.crm_cfg.enable_crm:
+            crm_provider = self.crm_cfg.crm_provider.lower()
             logger.info(f"Setting up {crm_provider} integration...")
             
             if crm_provider == 'hubspot':
@@ -226,101 +490,133 @@ class MarketingInstaller:
         """Set up HubSpot integration."""
         logger.info("Configuring HubSpot...")
         # This would involve OAuth and API calls in a real implementation
-        self.run_wp_cli("plugin install hubspot-crm --activate")
+        self.run_wp_cli("plugin", "install", "hubspot-crm", "--activate")
     
     def _setup_salesforce(self) -> None:
         """Set up Salesforce integration."""
         logger.info("Configuring Salesforce...")
         # This would involve OAuth and API calls in a real implementation
-        self.run_wp_cli("plugin install salesforce-wordpress-to-lead --activate")
+        self.run_wp_cli("plugin", "install", "salesforce-wordpress-to-lead", "--activate")
+    
+    # Creates a page and its meta in one call; wp_insert_post writes meta_input itself
+    CREATE_PAGE_PHP = (
+        "$id = wp_insert_post($data, true); "
+        "if (is_wp_error($id)) { WP_CLI::error($id->get_error_message()); } "
+        "echo $id;"
+    )
     
     def create_marketing_pages(self) -> None:
         """Create essential marketing pages."""
         logger.info("Creating marketing pages...")
         
-        pages = [
-            {
-                'title': 'Free IT Consultation',
-                'content': '<!-- wp:heading -->\n<h2>Get Your Free IT Consultation</h2>\n<!-- /wp:heading -->\n\n<!-- wp:paragraph -->\n<p>Fill out the form below to schedule your free 30-minute IT consultation.</p>\n<!-- /wp:paragraph -->\n\n<!-- wp:shortcode -->\n[contact-form-7 id="123" title="Free Consultation"]\n<!-- /wp:shortcode -->',
-                'status': 'publish',
-                'meta': {
-                    '_yoast_wpseo_title': 'Free IT Consultation | {site_title}',
-                    '_yoast_wpseo_metadesc': 'Schedule your free 30-minute IT consultation today. Our experts will analyze your current setup and provide actionable recommendations.'
-                }
-            },
-            {
-                'title': 'Case Studies',
-                'content': '<!-- wp:heading -->\n<h2>Success Stories</h2>\n<!-- /wp:heading -->\n\n<!-- wp:paragraph -->\n<p>Read how we helped businesses like yours achieve their IT and digital marketing goals.</p>\n<!-- /wp:paragraph -->',
-                'status': 'publish'
-            },
-            {
-                'title': 'Resources',
-                'content': '<!-- wp:heading -->\n<h2>IT &amp; Marketing Resources</h2>\n<!-- /wp:heading -->\n\n<!-- wp:paragraph -->\n<p>Download our free resources to help grow your business.</p>\n<!-- /wp:paragraph -->',
-                'status': 'publish'
-            }
-        ]
-        
-        for page in pages:
+        for page in _MARKETING_PAGES:
             logger.info(f"Creating page: {page['title']}")
             
-            # Create the page
-            cmd = f"post create --post_type=page --post_title=\"{page['title']}\" --post_status={page['status']} --post_content=\"{page['content']}\" --porcelain"
-            success, post_id = self.run_wp_cli(cmd)
+            # Create the page and its meta together
+            post = {
+                'post_type': 'page',
+                'post_title': page['title'],
+                'post_status': page['status'],
+                'post_content': _tpl(page['content_file']),
+                'meta_input': page.get('meta', {})
+            }
+            success, output = self.wp_cli.eval_php(self.CREATE_PAGE_PHP, post)
             
-            if success and 'meta' in page:
-                for meta_key, meta_value in page['meta'].items():
-                    self.run_wp_cli(f"post meta set {post_id.strip()} {meta_key} \"{meta_value}\"")
+            if success:
+                logger.info(f"✓ Created page {page['title']} (ID {output.strip()})")
+                try:
+                    self.created_page_ids.append(int(output.strip()))
+                except ValueError:
+                    logger.warning(f"Unexpected page ID for {page['title']}: {output.strip()}")
+            else:
+                logger.error(f"✗ Failed to create page {page['title']}: {output}")
+    
+    # Creates the Contact Form 7 form described by $data, or updates the one
+    # with the same title, through the plugin's own API in one call
+    CREATE_CF7_FORM_PHP = (
+        "if (!class_exists('WPCF7_ContactForm')) { WP_CLI::error('Contact Form 7 is not active'); } "
+        "$found = WPCF7_ContactForm::find(['title' => $data['title'], 'posts_per_page' => 1]); "
+        "$form = $found ? $found[0] : WPCF7_ContactForm::get_template(['title' => $data['title']]); "
+        "$form->set_properties(['form' => $data['form'], "
+        "'mail' => array_merge($form->prop('mail'), $data['mail']), "
+        "'messages' => array_merge($form->prop('messages'), $data['messages'])]); "
+        "echo $form->save();"
+    )
+    
+    @staticmethod
+    def _cf7_form(form: Dict[str, Any]) -> Dict[str, Any]:
+        """Translate a form definition into Contact Form 7 properties."""
+        fields = []
+        for field in form['fields']:
+            tag = field['type'] + ('*' if field.get('required') else '')
+            options = ''.join(f' "{option}"' for option in field.get('options', []))
+            fields.append(f"<label> {field['label']}\n    [{tag} {field['name']}{options}] </label>\n")
+        fields.append('[submit "Send"]')
+        
+        mail = dict(form['settings']['mail'])
+        mail['recipient'] = mail.pop('to')
+        mail['body'] = "\n".join(f"{field['label']}: [{field['name']}]" for field in form['fields'])
+        
+        return {
+            'title': form['title'],
+            'form': "\n".join(fields),
+            'mail': mail,
+            'messages': form['settings']['messages']
+        }
     
     def setup_forms(self) -> None:
         """Set up contact and lead capture forms."""
         logger.info("Setting up forms...")
         
-        # This is a simplified example - in a real implementation, you would use the plugin's API
-        # or import/export functionality to set up forms
-        
-        # Example: Create a contact form
-        contact_form = {
-            'title': 'Contact Us',
-            'fields': [
-                {'type': 'text', 'name': 'your-name', 'label': 'Name', 'required': True},
-                {'type': 'email', 'name': 'your-email', 'label': 'Email', 'required': True},
-                {'type': 'tel', 'name': 'your-phone', 'label': 'Phone'},
-                {'type': 'select', 'name': 'service', 'label': 'Service Interested In', 'options': ['Managed IT', 'Digital Marketing', 'Web Development', 'Other']},
-                {'type': 'textarea', 'name': 'your-message', 'label': 'Message'}
-            ],
-            'settings': {
-                'mail': {
-                    'active': True,
-                    'to': '[your-email]',
-                    'subject': 'New contact form submission from {your-name}'
-                },
-                'messages': {
-                    'mail_sent_ok': 'Thank you for your message. We will be in touch soon!'
-                }
-            }
-        }
+        # The whole form, mail and messages go to Contact Form 7 in one call
+        form = self._cf7_form(_CONTACT_FORM)
+        success, output = self.wp_cli.eval_php(self.CREATE_CF7_FORM_PHP, form)
         
-        # In a real implementation, you would save this form using the plugin's API
-        logger.info("✓ Contact form created")
+        if success:
+            logger.info(f"✓ Contact form created (ID {output.strip()})")
+        else:
+            logger.error(f"✗ Failed to create contact form: {output}")
+    
+    # Creates (or reuses) the Marketing menu, adds the pages in $data and
+    # assigns it to the primary location, all in one WordPress bootstrap
+    MARKETING_MENU_PHP = (
+        "$menu = wp_get_nav_menu_object('Marketing'); "
+        "$mid = $menu ? $menu->term_id : wp_create_nav_menu('Marketing'); "
+        "if (is_wp_error($mid)) { WP_CLI::error($mid->get_error_message()); } "
+        "foreach ($data as $pid) { "
+        "wp_update_nav_menu_item($mid, 0, ['menu-item-object-id' => $pid, 'menu-item-object' => 'page', "
+        "'menu-item-type' => 'post_type', 'menu-item-status' => 'publish']); } "
+        "$locations = get_theme_mod('nav_menu_locations', []); "
+        "$locations['primary'] = $mid; "
+        "set_theme_mod('nav_menu_locations', $locations); "
+        "echo $mid;"
+    )
     
     def finalize_setup(self) -> None:
         """Finalize the marketing setup."""
         logger.info("Finalizing marketing setup...")
         
-        # Create a menu for marketing pages
-        self.run_wp_cli("menu create 'Marketing'")
-        
-        # Add pages to the menu
-        self.run_wp_cli("menu item add-post menu-item menu-item-object-page menu-item-type-post_type menu-item-object-page menu-item-home current-menu-item current_page_item menu-item-home current-menu-ancestor current-menu-parent current_page_parent current_page_ancestor menu-item-has-children menu-item-1")
-        
-        # Set the menu location
-        self.run_wp_cli("menu location assign marketing primary")
+        # Create the marketing menu with its pages and set its location
+        success, output = self.wp_cli.eval_php(self.MARKETING_MENU_PHP, self.created_page_ids)
+        if not success:
+            logger.error(f"✗ Failed to set up the marketing menu: {output}")
+            return
         
         logger.info("✓ Marketing setup complete!")
 
 
 def main():
     """Main function to run the marketing setup."""
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('marketing_setup.log'),
+            logging.StreamHandler()
+        ]
+    )
+    
     print("=== WordPress Marketing Setup ===\n")
     
     # Load configuration
@@ -332,11 +628,20 @@ def main():
     try:
         # Run setup steps
         installer.install_plugins()
-        installer.configure_email_marketing()
-        installer.configure_seo()
-        installer.configure_social_media()
-        installer.configure_conversion_tools()
-        installer.setup_crm()
+        
+        # These steps write disjoint options, so they can run side by side
+        configure_steps = (
+            installer.configure_email_marketing,
+            installer.configure_seo,
+            installer.configure_social_media,
+            installer.configure_conversion_tools,
+            installer.setup_crm
+        )
+        with ThreadPoolExecutor(max_workers=len(configure_steps)) as pool:
+            futures = [pool.submit(step) for step in configure_steps]
+            for future in as_completed(futures):
+                future.result()
+        
         installer.create_marketing_pages()
         installer.setup_forms()
         installer.finalize_setup()
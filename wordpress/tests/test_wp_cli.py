@@ -0,0 +1,97 @@
+"""
+Tests for the shared WP-CLI runner in wp_utils.
+"""
+import sys
+import json
+import base64
+import re
+import unittest
+from pathlib import Path
+
+# The setup scripts import their helpers as sibling modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from wp_utils import WPCLI
+
+
+def _python(source: str) -> tuple:
+    """argv prefix that stands in for `wp` by running a Python snippet."""
+    return (sys.executable, "-c", source)
+
+
+class TestWPCLIRun(unittest.TestCase):
+    """Tests for WPCLI.run."""
+
+    def test_argv_prefix(self):
+        self.assertEqual(WPCLI("/var/www/html").argv, ("wp", "--path=/var/www/html"))
+        self.assertEqual(WPCLI().argv, ("wp",))
+        self.assertEqual(WPCLI("").argv, ("wp",))
+
+    def test_returns_stdout_without_stderr(self):
+        cli = WPCLI()
+        cli.argv = _python(
+            "import sys; sys.stderr.write('PHP Warning: deprecated\\n'); print('[1, 2]')"
+        )
+        with self.assertLogs("wp_utils", level="INFO") as logs:
+            ok, output = cli.run()
+        self.assertTrue(ok)
+        self.assertEqual(output, "[1, 2]")
+        self.assertIn("WARNING:wp_utils:PHP Warning: deprecated", logs.output)
+
+    def test_returns_all_stdout_lines(self):
+        cli = WPCLI()
+        cli.argv = _python("for i in range(120): print(i)")
+        with self.assertLogs("wp_utils", level="INFO"):
+            ok, output = cli.run()
+        self.assertTrue(ok)
+        self.assertEqual(output.splitlines(), [str(i) for i in range(120)])
+
+    def test_failure_reports_stderr_and_command(self):
+        cli = WPCLI()
+        cli.argv = _python("import sys; sys.stderr.write('Error: nope\\n'); sys.exit(1)")
+        with self.assertLogs("wp_utils", level="WARNING"):
+            ok, output = cli.run("plugin", "install")
+        self.assertFalse(ok)
+        self.assertTrue(output.startswith("Error: nope\nCommand: "))
+        self.assertTrue(output.endswith("plugin install"))
+
+
+class TestWPCLIEval(unittest.TestCase):
+    """Tests for WPCLI.eval_php and WPCLI.update_options."""
+
+    def setUp(self):
+        # Stand-in for `wp` that echoes the arguments it was given
+        self.cli = WPCLI()
+        self.cli.argv = _python("import sys, json; print(json.dumps(sys.argv[1:]))")
+
+    def _payload(self, code: str):
+        """Decode the JSON payload embedded in the PHP code."""
+        match = re.match(r"\$data = json_decode\(base64_decode\('([A-Za-z0-9+/=]*)'\), true\); ", code)
+        self.assertIsNotNone(match, code)
+        return json.loads(base64.b64decode(match.group(1))), code[match.end():]
+
+    def test_update_options_argv(self):
+        options = {
+            "blogname": "Joe's \"IT\" Shop",
+            "wpseo_titles": {"noindex-search": "1"},
+        }
+        ok, output = self.cli.update_options(options)
+        self.assertTrue(ok)
+
+        # `wp eval` takes exactly one positional argument: the code
+        argv = json.loads(output)
+        self.assertEqual(len(argv), 2)
+        self.assertEqual(argv[0], "eval")
+        data, php = self._payload(argv[1])
+        self.assertEqual(data, options)
+        self.assertEqual(php, WPCLI.UPDATE_OPTIONS_PHP)
+        self.assertNotIn("$args", php)
+
+    def test_eval_without_data(self):
+        ok, output = self.cli.eval_php("echo 1;")
+        self.assertTrue(ok)
+        self.assertEqual(json.loads(output), ["eval", "echo 1;"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+WordPress Setup Helpers
+
+Shared by the analytics and marketing setup scripts in this directory so that
+WP-CLI is invoked the same way everywhere.
+"""
+import os
+import json
+import shlex
+import base64
+import logging
+import functools
+import threading
+import collections
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson  # Optional; parses JSON faster than json
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+@functools.lru_cache(maxsize=8)
+def load_json_cached(path: str, mtime_ns: int) -> Any:
+    """Parse a JSON config file; the mtime key invalidates entries when it changes.
+
+    The result is shared between callers, so copy it before mutating it.
+    """
+    data = Path(path).read_bytes()
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def atomic_write_json(path: Path, data: Any) -> None:
+    """Write data as indented JSON via a temporary file, so readers never see a partial file."""
+    tmp_path = path.with_suffix('.tmp')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path.write_text(json.dumps(data, indent=2))
+    os.replace(tmp_path, path)
+
+
+class WPCLI:
+    """Runs WP-CLI commands against one WordPress installation."""
+
+    # Lines of stderr (or stdout, if stderr is empty) reported when a run fails
+    OUTPUT_TAIL_LINES = 50
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize with the WordPress installation path, if not the current directory."""
+        # Fixed prefix that every command is appended to
+        self.argv: Tuple[str, ...] = ("wp", f"--path={path}") if path else ("wp",)
+
+    @staticmethod
+    def _drain(stream, level: int, lines) -> None:
+        """Log a pipe line by line, appending each line to lines."""
+        for line in stream:
+            line = line.rstrip("\n")
+            logger.log(level, line)
+            lines.append(line)
+
+    def run(self, *args: str) -> Tuple[bool, str]:
+        """Run a WP-CLI command given as separate arguments; returns its stdout only."""
+        cmd = self.argv + args
+
+        # Log output as it arrives; stdout is kept whole for the caller, stderr
+        # only as a tail for the error. stderr is drained on its own thread so
+        # warnings never reach the output callers parse, and neither pipe can
+        # fill up and stall WP-CLI.
+        out_lines: List[str] = []
+        err_tail = collections.deque(maxlen=self.OUTPUT_TAIL_LINES)
+        with subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        ) as proc:
+            stderr_reader = threading.Thread(
+                target=self._drain,
+                args=(proc.stderr, logging.WARNING, err_tail),
+                daemon=True
+            )
+            stderr_reader.start()
+            self._drain(proc.stdout, logging.INFO, out_lines)
+            stderr_reader.join()
+
+        if proc.returncode == 0:
+            return True, "\n".join(out_lines)
+        errors = "\n".join(err_tail or out_lines[-self.OUTPUT_TAIL_LINES:])
+        return False, f"{errors}\nCommand: {shlex.join(cmd)}"
+
+    def eval_php(self, php: str, data: Any = None) -> Tuple[bool, str]:
+        """Run PHP with `wp eval`, exposing data to it as the decoded array $data."""
+        # wp eval accepts nothing but the code, so the payload travels inside it;
+        # base64 keeps quotes in the JSON from ever meeting PHP string syntax
+        if data is not None:
+            payload = base64.b64encode(json.dumps(data).encode()).decode("ascii")
+            php = f"$data = json_decode(base64_decode('{payload}'), true); {php}"
+        return self.run("eval", php)
+
+    # Writes every option in $data; array values are merged into the stored array
+    UPDATE_OPTIONS_PHP = (
+        "foreach ($data as $name => $value) { "
+        "if (is_array($value)) { $value = array_merge((array) get_option($name, []), $value); } "
+        "update_option($name, $value); }"
+    )
+
+    def update_options(self, options: Dict[str, Any]) -> Tuple[bool, str]:
+        """Update several WordPress options with a single WP-CLI call."""
+        return self.eval_php(self.UPDATE_OPTIONS_PHP, options)